@@ -1,46 +1,35 @@
 import sys
+from array import array
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QApplication, QWidget, QVBoxLayout, QPushButton, QTableView, QHeaderView,
     QHBoxLayout, QMessageBox, QFileDialog, QInputDialog
 )
-from datetime import datetime
+import calendar  # Для проверки количества дней в месяце
+import csv  # Разбор строк CSV (реализован на C, поддерживает поля в кавычках)
 import re  # Для проверки формата даты
 
+# Шаблон дат dd.mm.yyyy, разделенных переводом строки: вся колонка проверяется одним вызовом
+_DATE_PATTERN = r"(?:0[1-9]|[12][0-9]|3[01])\.(?:0[1-9]|1[0-2])\.(?:19|20)[0-9]{2}"
+_DATES_RE = re.compile(rf"{_DATE_PATTERN}(?:\n{_DATE_PATTERN})*")
 
-class Measurement:
-    """Базовый класс для измерений температуры."""
+# Статусы измерений интернированы: все строки таблицы ссылаются на один и тот же объект
+_NORMAL = sys.intern("Нормальное измерение")
+_ABNORMAL = sys.intern("Аномальное измерение")
+_STATUSES = {_NORMAL: _NORMAL, _ABNORMAL: _ABNORMAL}  # Прочитанный статус -> интернированный
 
-    def __init__(self, status, date, location, value):
-        self.status = status  # Статус измерения (например, "Нормальное измерение")
-        self.date = date  # Дата измерения в строковом формате
-        self.location = location  # Место измерения
-        self.value = float(value)  # Значение температуры, приведенное к float
+# Имена колонок хранилища измерений (по одному списку на колонку таблицы)
+COLUMNS = ("status", "date", "location", "value", "detail")
 
-    def to_table_row(self):
-        """Преобразует поля объекта в список для отображения в таблице."""
-        return [self.status, self.date, self.location, f"{self.value:.2f}"]
 
+def new_columns():
+    """Создает пустое хранилище измерений: словарь параллельных списков.
 
-class NormalMeasurement(Measurement):
-    """Представляет нормальное измерение температуры."""
-
-    def __init__(self, date, location, value, sensor_type):
-        super().__init__("Нормальное измерение", date, location, value)  # Вызов конструктора базового класса
-        self.sensor_type = sensor_type  # Тип датчика
-
-    def to_table_row(self):
-        return super().to_table_row() + [self.sensor_type]  # Добавление типа датчика в таблицу
-
-
-class AbnormalMeasurement(Measurement):
-    """Представляет аномальное измерение температуры."""
-
-    def __init__(self, date, location, value, reason):
-        super().__init__("Аномальное измерение", date, location, value)  # Установка статуса как аномального
-        self.reason = reason  # Причина аномалии
-
-    def to_table_row(self):
-        return super().to_table_row() + [self.reason]  # Добавление причины в таблицу
+    Значения температуры хранятся в array("d") — 8 байт на число вместо объекта float.
+    """
+    cols = {name: [] for name in COLUMNS}
+    cols["value"] = array("d")
+    return cols
 
 
 class MeasurementParser:
@@ -48,40 +37,144 @@ class MeasurementParser:
 
     @staticmethod
     def validate_date(date_str):
-        """Проверяет, соответствует ли строка формату dd.mm.yyyy."""
-        pattern = r"^(0[1-9]|[12][0-9]|3[01])\.(0[1-9]|1[0-2])\.(19|20)\d{2}$"
-        if not re.match(pattern, date_str):
+        """Проверяет, соответствует ли строка формату dd.mm.yyyy.
+
+        Вместо регулярного выражения проверяются длина, позиции точек и цифры,
+        затем диапазоны дня, месяца и года. В C-расширении ту же проверку можно
+        свести к одному SIMD-сравнению 10 байт с маской.
+        """
+        digits = date_str[:2] + date_str[3:5] + date_str[6:]
+        if (len(date_str) != 10 or date_str[2] != "." or date_str[5] != "."
+                or not (digits.isascii() and digits.isdigit())):
+            raise ValueError("Неверный формат даты. Ожидается формат dd.mm.yyyy.")
+        day, month, year = int(date_str[:2]), int(date_str[3:5]), int(date_str[6:])
+        if not (1 <= day <= 31 and 1 <= month <= 12 and 1900 <= year <= 2099):
             raise ValueError("Неверный формат даты. Ожидается формат dd.mm.yyyy.")
+        if day > calendar.monthrange(year, month)[1]:  # Например, 31.02 или 29.02 в невисокосный год
+            raise ValueError("Несуществующая дата.")
         return True
 
     @staticmethod
-    def parse_line(line):
-        fields = line.strip().split(";")  # Разделение строки по символу ';'
-        if len(fields) < 5:
-            raise ValueError("Недостаточно данных в строке.")
+    def validate_dates_bulk(dates):
+        """Проверяет колонку дат целиком; при ошибке ищет конкретную неверную дату."""
+        unique = set(dates)  # Одинаковые даты проверяются один раз
+        if not unique:
+            return True
+        joined = "\n".join(unique)
+        # Длина гарантирует, что ни одна дата не содержала перевода строки внутри себя
+        if len(joined) != 11 * len(unique) - 1 or not _DATES_RE.fullmatch(joined):
+            for date_str in unique:
+                MeasurementParser.validate_date(date_str)
+        for date_str in unique:
+            if date_str[:2] > "28":  # Число дней в месяце имеет значение только для 29-31 числа
+                MeasurementParser.validate_date(date_str)
+        return True
 
-        # Проверка и преобразование даты
-        MeasurementParser.validate_date(fields[1])
-        date = datetime.strptime(fields[1], "%d.%m.%Y").strftime("%d-%m-%Y")
+    @staticmethod
+    def load_measurements_from_file(path):
+        """Загружает измерения в хранилище по колонкам, не создавая объект на каждую строку.
+
+        Файл читается целиком, строки транспонируются в колонки, а проверки
+        выполняются сразу по всей колонке, а не построчно.
+        """
+        with open(path, "r", encoding="cp1251", newline="") as file:  # Открытие файла в кодировке Windows-1251
+            # Пробелы и перевод строки по краям отбрасываются до разбора, как при построчном чтении
+            rows = list(csv.reader(map(str.strip, file), delimiter=";"))
+
+        cols = new_columns()
+        if not rows:
+            return cols
+        if min(map(len, rows)) < 5:
+            raise ValueError("Недостаточно данных в строке.")
 
-        location = fields[2]  # Место измерения
-        value = float(fields[3])  # Значение температуры
+        statuses, dates, locations, values, details = zip(*(fields[:5] for fields in rows))
 
-        if fields[0] == "Нормальное измерение":
-            return NormalMeasurement(date, location, value, fields[4])  # Создание нормального измерения
-        elif fields[0] == "Аномальное измерение":
-            return AbnormalMeasurement(date, location, value, fields[4])  # Создание аномального измерения
-        else:
+        if not set(statuses) <= _STATUSES.keys():
             raise ValueError("Неизвестный тип измерения.")
+        MeasurementParser.validate_dates_bulk(dates)
 
-    @staticmethod
-    def load_measurements_from_file(path):
-        measurements = []
-        with open(path, "r", encoding="cp1251") as file:  # Открытие файла в кодировке Windows-1251
-            for line in file:
-                measurement = MeasurementParser.parse_line(line)  # Парсинг каждой строки
-                measurements.append(measurement)  # Добавление объекта в список
-        return measurements
+        cols["status"] = list(map(_STATUSES.__getitem__, statuses))
+        cols["date"] = [date_str.replace(".", "-") for date_str in dates]
+        cols["location"] = list(locations)
+        cols["value"] = array("d", map(float, values))
+        cols["detail"] = list(details)
+        return cols
+
+
+class MeasurementModel(QAbstractTableModel):
+    """Модель таблицы, берущая данные напрямую из колонок хранилища измерений."""
+
+    HEADERS = ["Тип", "Дата", "Место", "Значение", "Детали"]
+    FETCH_BATCH = 200  # Сколько строк показывать за одну подгрузку
+
+    def __init__(self, cols, parent=None):
+        super().__init__(parent)
+        self._cols = cols  # Колонки измерений, общие с главным окном
+        self._visible = min(len(cols["status"]), self.FETCH_BATCH)  # Число строк, уже отданных представлению
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._visible < len(self._cols["status"])
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Подгружает очередную порцию строк при прокрутке таблицы."""
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, len(self._cols["status"]) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        name = COLUMNS[index.column()]
+        value = self._cols[name][index.row()]
+        return f"{value:.2f}" if name == "value" else value  # Текст ячейки
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1  # Номера строк
+
+    def set_columns(self, cols):
+        """Полностью заменяет набор измерений."""
+        self.beginResetModel()
+        self._cols = cols
+        self._visible = min(len(cols["status"]), self.FETCH_BATCH)
+        self.endResetModel()
+
+    def append_record(self, record):
+        """Добавляет измерение в конец хранилища и возвращает номер его строки."""
+        row = len(self._cols["status"])
+        # Еще не подгруженные строки открываются вместе с новой одним сигналом,
+        # иначе добавленное измерение появилось бы только после прокрутки до конца
+        self.beginInsertRows(QModelIndex(), self._visible, row)
+        for name, field in zip(COLUMNS, record):
+            self._cols[name].append(field)  # Добавление поля в свою колонку
+        self._visible = row + 1
+        self.endInsertRows()
+        return row
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        """Удаляет count измерений начиная со строки row одним срезом в каждой колонке."""
+        if parent.isValid() or count <= 0 or row < 0 or row + count > self._visible:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for column in self._cols.values():
+            del column[row:row + count]  # Один сдвиг хвоста колонки на весь диапазон
+        self._visible -= count
+        self.endRemoveRows()
+        return True
 
 
 class MainWindow(QWidget):
@@ -92,13 +185,16 @@ class MainWindow(QWidget):
         self.setWindowTitle("Измерения температуры")  # Заголовок окна
         self.setGeometry(200, 200, 800, 400)  # Размер и позиция окна
 
-        self.measurements = []  # Список всех загруженных измерений
+        self.cols = new_columns()  # Все загруженные измерения, по колонкам
 
-        self.table = QTableWidget()  # Таблица для отображения данных
-        self.table.setColumnCount(5)  # Установка количества колонок
-        self.table.setHorizontalHeaderLabels([
-            "Тип", "Дата", "Место", "Значение", "Детали"
-        ])
+        self.model = MeasurementModel(self.cols)  # Модель данных таблицы
+        self.table = QTableView()  # Таблица для отображения данных
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)  # Выделение строк целиком
+        # Фиксированные размеры секций: Qt не измеряет текст каждой ячейки при загрузке
+        self.table.horizontalHeader().setDefaultSectionSize(140)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
         self.load_button = QPushButton("Загрузить файл")
         self.load_button.clicked.connect(self.load_file)  # Обработчик кнопки загрузки
@@ -124,18 +220,13 @@ class MainWindow(QWidget):
         file_path, _ = QFileDialog.getOpenFileName(self, "Открыть CSV файл", "", "CSV Files (*.csv)")
         if file_path:
             try:
-                self.measurements = MeasurementParser.load_measurements_from_file(file_path)  # Загрузка измерений
+                self.cols = MeasurementParser.load_measurements_from_file(file_path)  # Загрузка измерений
                 self.update_table()  # Обновление таблицы
             except Exception as e:
                 self.show_error(f"Ошибка при загрузке: {e}")  # Обработка ошибки загрузки
 
     def update_table(self):
-        self.table.setRowCount(0)  # Очистка таблицы
-        for measurement in self.measurements:
-            row_position = self.table.rowCount()  # Позиция новой строки
-            self.table.insertRow(row_position)  # Добавление строки
-            for col, value in enumerate(measurement.to_table_row()):
-                self.table.setItem(row_position, col, QTableWidgetItem(value))  # Заполнение ячеек
+        self.model.set_columns(self.cols)  # Представление перерисует только видимые строки
 
     def add_measurement(self):
         types = ["Нормальное", "Аномальное"]
@@ -159,23 +250,29 @@ class MainWindow(QWidget):
         try:
             # Проверка даты
             MeasurementParser.validate_date(date)
-            formatted_date = datetime.strptime(date, "%d.%m.%Y").strftime("%d-%m-%Y")  # Форматирование даты
+            formatted_date = date.replace(".", "-")  # Форматирование даты
+            status = _NORMAL if type_choice == "Нормальное" else _ABNORMAL
+            record = (status, formatted_date, location, float(value), detail)
 
-            if type_choice == "Нормальное":
-                measurement = NormalMeasurement(formatted_date, location, value, detail)  # Создание нормального измерения
-            else:
-                measurement = AbnormalMeasurement(formatted_date, location, value, detail)  # Создание аномального измерения
-
-            self.measurements.append(measurement)  # Добавление в список
-            self.update_table()  # Обновление таблицы
+            row = self.model.append_record(record)  # Добавление в хранилище
+            self.table.scrollTo(self.model.index(row, 0))  # Показ добавленного измерения
         except Exception as e:
             self.show_error(f"Ошибка при добавлении: {e}")  # Обработка ошибки
 
     def delete_selected(self):
-        selected_row = self.table.currentRow()  # Получение текущей строки
-        if selected_row >= 0:
-            self.measurements.pop(selected_row)  # Удаление из списка
-            self.update_table()  # Обновление таблицы
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}  # Выделенные строки
+        if not rows and self.table.currentIndex().isValid():
+            rows = {self.table.currentIndex().row()}  # Текущая строка, если ничего не выделено
+        # Соседние строки удаляются одним диапазоном, снизу вверх, чтобы номера не смещались
+        ranges = []
+        for row in sorted(rows, reverse=True):
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+                ranges[-1][1] += 1
+            else:
+                ranges.append([row, 1])
+        for row, count in ranges:
+            self.model.removeRows(row, count)  # Удаление из хранилища
 
     def show_error(self, message):
         QMessageBox.critical(self, "Ошибка", message)  # Показ сообщения об ошибке